@@ -15,20 +15,25 @@ from __future__ import annotations
 import argparse
 import csv
 import datetime as dt
-import hashlib
-import json
+import functools
 import re
 import sys
+import threading
 import time
 import urllib.parse
-from collections import defaultdict
+from collections import Counter
 from dataclasses import dataclass
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
+import orjson
 import requests
-from bs4 import BeautifulSoup
+import requests_cache
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 WIKIMEDIA_REST = "https://wikimedia.org/api/rest_v1"
 WDQS_ENDPOINT = "https://query.wikidata.org/sparql"
@@ -43,7 +48,7 @@ GOAT_LIST_QUERIES = [
     {"id": "tspdt", "query": "They Shoot Pictures, Don't They?"},
 ]
 
-EXCLUDED_NAMESPACE_PREFIXES = {
+EXCLUDED_NAMESPACE_PREFIXES = frozenset({
     "File",
     "Category",
     "Wikipedia",
@@ -56,7 +61,20 @@ EXCLUDED_NAMESPACE_PREFIXES = {
     "Draft",
     "Module",
     "Book",
-}
+})
+
+WHITESPACE_RE = re.compile(r"\s+")
+RANK_RE = re.compile(r"\b(\d{1,3})\b")
+FIRST_CELL_XPATH = etree.XPath("(.//th | .//td)[1]")
+FILM_CATEGORY_RE = re.compile(r"^Category:.*films?$")
+HTML_FEED_CHUNK = 64 * 1024
+
+# WDQS throttles per client; keep concurrent SPARQL queries low regardless of --max-workers.
+WDQS_MAX_CONCURRENCY = 2
+WDQS_SEMAPHORE = threading.Semaphore(WDQS_MAX_CONCURRENCY)
+
+# Seconds without a retry before the next back-off is reported as a new burst.
+BACKOFF_LOG_INTERVAL = 30.0
 
 
 @dataclass(frozen=True)
@@ -115,48 +133,118 @@ def date_range_for_months(months: List[Tuple[int, int]]) -> Tuple[str, str]:
     return start_date.strftime("%Y%m%d"), end_day.strftime("%Y%m%d")
 
 
-def cache_path(cache_dir: Path, key: str) -> Path:
-    safe = re.sub(r"[^a-zA-Z0-9._-]", "_", key)
-    return cache_dir / f"{safe}.json"
+class BackoffRetry(Retry):
+    """Retry that reports the first back-off of each burst on stderr."""
+
+    _log_lock = threading.Lock()
+    _last_backoff = float("-inf")
+
+    def sleep(self, response=None) -> None:
+        now = time.monotonic()
+        with BackoffRetry._log_lock:
+            if now - BackoffRetry._last_backoff >= BACKOFF_LOG_INTERVAL and self.history:
+                last = self.history[-1]
+                reason = f"HTTP {last.status}" if last.status else str(last.error)
+                print(f"[warn] Backing off after {reason} from {last.url}", file=sys.stderr)
+            BackoffRetry._last_backoff = now
+        super().sleep(response)
+
+
+def is_cacheable_response(response: requests.Response) -> bool:
+    # Only per-article pageviews treat 404 as data ("no views that month"); elsewhere it is an error.
+    return response.status_code != 404 or "/metrics/pageviews/per-article/" in response.url
+
+
+def pageviews_expire_after(year: int, month: int) -> requests_cache.ExpirationTime:
+    # The newest month can 404 for a few days until it is loaded, so recheck it daily;
+    # older months never change.
+    if (year, month) >= last_complete_month(dt.date.today()):
+        return dt.timedelta(days=1)
+    return requests_cache.NEVER_EXPIRE
+
+
+class SeedSession(requests_cache.CachedSession):
+    """CachedSession that can skip cache reads while still saving fresh responses."""
+
+    force_refresh = False
+
+
+def build_session(
+    user_agent: str,
+    max_workers: int,
+    cache_dir: Path,
+    use_cache: bool,
+    save_cache: bool,
+) -> SeedSession:
+    # One pooled session per process; keep-alive connections are shared by worker threads.
+    # Lifetimes are set here (and per request for pageviews) rather than taken from
+    # response Cache-Control, whose short max-age would otherwise override them.
+    session = SeedSession(
+        cache_dir / "http.sqlite",
+        backend="sqlite",
+        expire_after=dt.timedelta(days=30),
+        urls_expire_after={
+            # api.php answers max-age=0 with no validators; categories and list pages change slowly.
+            "en.wikipedia.org/w/api.php": dt.timedelta(days=7),
+        },
+        allowable_codes=(200, 404),
+        allowable_methods=("GET", "HEAD", "POST"),
+        filter_fn=is_cacheable_response,
+    )
+    if not use_cache and not save_cache:
+        session.settings.disabled = True
+    elif not save_cache:
+        session.settings.read_only = True
+    elif not use_cache:
+        session.force_refresh = True
+    session.headers.update({"User-Agent": user_agent})
+    adapter = HTTPAdapter(
+        pool_connections=max_workers,
+        pool_maxsize=max_workers * 2,
+        max_retries=BackoffRetry(
+            total=6,
+            backoff_factor=2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "POST"],
+            respect_retry_after_header=True,
+        ),
+    )
+    session.mount("https://", adapter)
+    return session
 
 
 def fetch_json(
     url: str,
+    session: SeedSession,
     params: Optional[Dict[str, str]] = None,
-    headers: Optional[Dict[str, str]] = None,
-    cache_dir: Optional[Path] = None,
-    cache_key: Optional[str] = None,
-    use_cache: bool = True,
-    save_cache: bool = False,
+    method: str = "GET",
+    data: Optional[Dict[str, str]] = None,
     sleep: float = 0.0,
     timeout: int = 30,
+    expire_after: Optional[requests_cache.ExpirationTime] = None,
 ) -> Dict:
-    if cache_dir and cache_key and use_cache:
-        cached = cache_path(cache_dir, cache_key)
-        if cached.exists():
-            return json.loads(cached.read_text())
-
-    if sleep:
+    response = session.request(
+        method,
+        url,
+        params=params,
+        data=data,
+        timeout=timeout,
+        force_refresh=session.force_refresh,
+        expire_after=expire_after,
+    )
+    # Only throttle real network traffic; cache hits return immediately.
+    if sleep and not getattr(response, "from_cache", False):
         time.sleep(sleep)
 
-    response = requests.get(url, params=params, headers=headers, timeout=timeout)
     response.raise_for_status()
-    data = response.json()
-
-    if cache_dir and cache_key and save_cache:
-        cache_path(cache_dir, cache_key).write_text(json.dumps(data))
-
-    return data
+    return orjson.loads(response.content)
 
 
 def is_article_title(title: str) -> bool:
     if title in {"Main_Page", "Main Page"}:
         return False
-    if ":" in title:
-        prefix = title.split(":", 1)[0]
-        if prefix in EXCLUDED_NAMESPACE_PREFIXES:
-            return False
-    return True
+    idx = title.find(":")
+    return idx < 0 or title[:idx] not in EXCLUDED_NAMESPACE_PREFIXES
 
 
 def title_to_url(title: str) -> str:
@@ -173,21 +261,15 @@ def url_to_title(url: str) -> str:
 def fetch_top_month(
     year: int,
     month: int,
-    headers: Dict[str, str],
-    cache_dir: Path,
-    use_cache: bool,
-    save_cache: bool,
+    session: SeedSession,
     sleep: float,
 ) -> List[Dict]:
     url = f"{WIKIMEDIA_REST}/metrics/pageviews/top/en.wikipedia.org/all-access/{year}/{month:02d}/all-days"
     data = fetch_json(
         url,
-        headers=headers,
-        cache_dir=cache_dir,
-        cache_key=f"top_{year}_{month:02d}",
-        use_cache=use_cache,
-        save_cache=save_cache,
+        session=session,
         sleep=sleep,
+        expire_after=pageviews_expire_after(year, month),
     )
     items = data.get("items", [])
     if not items:
@@ -198,44 +280,44 @@ def fetch_top_month(
 def build_candidate_titles(
     months: List[Tuple[int, int]],
     top_limit: int,
-    headers: Dict[str, str],
-    cache_dir: Path,
-    use_cache: bool,
-    save_cache: bool,
+    session: SeedSession,
     sleep: float,
+    max_workers: int,
 ) -> Dict[str, int]:
-    totals: Dict[str, int] = defaultdict(int)
-    for year, month in months:
-        articles = fetch_top_month(
+    def fetch_one(year_month: Tuple[int, int]) -> List[Dict]:
+        year, month = year_month
+        return fetch_top_month(
             year=year,
             month=month,
-            headers=headers,
-            cache_dir=cache_dir,
-            use_cache=use_cache,
-            save_cache=save_cache,
+            session=session,
             sleep=sleep,
         )
-        for entry in articles[:top_limit]:
-            title = entry.get("article")
-            if not title or not is_article_title(title):
-                continue
-            totals[title.replace("_", " ")] += int(entry.get("views", 0))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        monthly_articles = list(executor.map(fetch_one, months))
+
+    # Merge in the calling thread so totals is never shared across workers.
+    totals: Counter[str] = Counter()
+    for articles in monthly_articles:
+        totals.update(
+            {
+                entry["article"].replace("_", " "): int(entry.get("views", 0))
+                for entry in articles[:top_limit]
+                if entry.get("article") and is_article_title(entry["article"])
+            }
+        )
     return totals
 
 
 def wdqs_film_filter(
     titles: List[str],
-    headers: Dict[str, str],
-    cache_dir: Path,
-    use_cache: bool,
-    save_cache: bool,
+    session: SeedSession,
     sleep: float,
 ) -> List[FilmItem]:
     if not titles:
         return []
 
-    article_urls = [title_to_url(t) for t in titles]
-    values_block = " ".join(f"<{u}>" for u in article_urls)
+    values_block = " ".join(f"<{title_to_url(t)}>" for t in titles)
 
     query = f"""
 PREFIX schema: <http://schema.org/>
@@ -250,28 +332,28 @@ SELECT ?article ?item ?itemLabel WHERE {{
 }}
 """
 
-    params = {"query": query, "format": "json"}
-    data = fetch_json(
-        WDQS_ENDPOINT,
-        params=params,
-        headers=headers,
-        cache_dir=cache_dir,
-        cache_key=f"wdqs_{hashlib.sha1(values_block.encode('utf-8')).hexdigest()}",
-        use_cache=use_cache,
-        save_cache=save_cache,
-        sleep=sleep,
-        timeout=60,
-    )
+    # POST keeps large VALUES blocks out of the URL length limit.
+    form = {"query": query, "format": "json"}
+    with WDQS_SEMAPHORE:
+        data = fetch_json(
+            WDQS_ENDPOINT,
+            method="POST",
+            data=form,
+            session=session,
+            sleep=sleep,
+            timeout=60,
+        )
 
     results = []
     for binding in data.get("results", {}).get("bindings", []):
         article_url = binding["article"]["value"]
         wikidata_id = binding["item"]["value"].rsplit("/", 1)[-1]
-        label = binding.get("itemLabel", {}).get("value") or url_to_title(article_url)
+        wikipedia_title = url_to_title(article_url)
+        label = binding.get("itemLabel", {}).get("value") or wikipedia_title
         results.append(
             FilmItem(
                 title=label,
-                wikipedia_title=url_to_title(article_url),
+                wikipedia_title=wikipedia_title,
                 wikidata_id=wikidata_id,
             )
         )
@@ -280,55 +362,67 @@ SELECT ?article ?item ?itemLabel WHERE {{
 
 def filter_films(
     titles: List[str],
-    headers: Dict[str, str],
-    cache_dir: Path,
-    use_cache: bool,
-    save_cache: bool,
+    session: SeedSession,
     sleep: float,
-    batch_size: int = 200,
+    max_workers: int,
+    batch_size: int = 75,
 ) -> List[FilmItem]:
+    batches = [titles[i : i + batch_size] for i in range(0, len(titles), batch_size)]
+    with ThreadPoolExecutor(max_workers=min(max_workers, WDQS_MAX_CONCURRENCY)) as executor:
+        batch_results = list(
+            executor.map(
+                lambda batch: wdqs_film_filter(batch, session=session, sleep=sleep),
+                batches,
+            )
+        )
+
     films: Dict[str, FilmItem] = {}
-    for i in range(0, len(titles), batch_size):
-        batch = titles[i : i + batch_size]
-        for item in wdqs_film_filter(
-            batch,
-            headers=headers,
-            cache_dir=cache_dir,
-            use_cache=use_cache,
-            save_cache=save_cache,
-            sleep=sleep,
-        ):
+    for items in batch_results:
+        for item in items:
             key = normalize_key(item.wikipedia_title)
             if key not in films:
                 films[key] = item
     return list(films.values())
 
 
+def fetch_pageviews_month(
+    article: str,
+    year: int,
+    month: int,
+    session: SeedSession,
+    sleep: float,
+) -> int:
+    start, end = date_range_for_months([(year, month)])
+    url = f"{WIKIMEDIA_REST}/metrics/pageviews/per-article/en.wikipedia.org/all-access/all-agents/{article}/monthly/{start}/{end}"
+    try:
+        data = fetch_json(
+            url,
+            session=session,
+            sleep=sleep,
+            expire_after=pageviews_expire_after(year, month),
+        )
+    except requests.HTTPError as exc:
+        # The API answers 404 for months with no recorded views (e.g. before the article existed).
+        if exc.response is not None and exc.response.status_code == 404:
+            return 0
+        raise
+    return sum(int(item.get("views", 0)) for item in data.get("items", []))
+
+
 def fetch_pageviews_total(
     title: str,
-    start: str,
-    end: str,
-    headers: Dict[str, str],
-    cache_dir: Path,
-    use_cache: bool,
-    save_cache: bool,
+    months: List[Tuple[int, int]],
+    session: SeedSession,
     sleep: float,
 ) -> int:
     article = urllib.parse.quote(title.replace(" ", "_"), safe="")
-    url = f"{WIKIMEDIA_REST}/metrics/pageviews/per-article/en.wikipedia.org/all-access/all-agents/{article}/daily/{start}/{end}"
-    data = fetch_json(
-        url,
-        headers=headers,
-        cache_dir=cache_dir,
-        cache_key=f"pv_{article}_{start}_{end}",
-        use_cache=use_cache,
-        save_cache=save_cache,
-        sleep=sleep,
+    return sum(
+        fetch_pageviews_month(article, year, month, session=session, sleep=sleep)
+        for year, month in months
     )
-    return sum(int(item.get("views", 0)) for item in data.get("items", []))
 
 
-def mw_opensearch(query: str, headers: Dict[str, str], sleep: float) -> Optional[str]:
+def mw_opensearch(query: str, session: SeedSession, sleep: float) -> Optional[str]:
     params = {
         "action": "opensearch",
         "search": query,
@@ -339,7 +433,7 @@ def mw_opensearch(query: str, headers: Dict[str, str], sleep: float) -> Optional
     data = fetch_json(
         MW_API,
         params=params,
-        headers=headers,
+        session=session,
         sleep=sleep,
     )
     if isinstance(data, list) and len(data) >= 2 and data[1]:
@@ -347,83 +441,149 @@ def mw_opensearch(query: str, headers: Dict[str, str], sleep: float) -> Optional
     return None
 
 
-def mw_parse_html(page_title: str, headers: Dict[str, str], sleep: float) -> Optional[str]:
+def mw_parse_html(page_title: str, session: SeedSession, sleep: float) -> Optional[str]:
     params = {
         "action": "parse",
         "page": page_title,
         "prop": "text",
         "format": "json",
     }
-    data = fetch_json(MW_API, params=params, headers=headers, sleep=sleep)
+    data = fetch_json(MW_API, params=params, session=session, sleep=sleep)
     if "parse" not in data:
         return None
     return data["parse"]["text"]["*"]
 
 
+def mw_batch_categories(titles: List[str], session: SeedSession, sleep: float) -> Set[str]:
+    base_params = {
+        "action": "query",
+        "prop": "categories",
+        "titles": "|".join(titles),
+        "clshow": "!hidden",
+        "cllimit": "max",
+        "format": "json",
+        "formatversion": "2",
+    }
+    params = dict(base_params)
+    film_titles: Set[str] = set()
+    normalized: Dict[str, str] = {}
+    while True:
+        data = fetch_json(MW_API, method="POST", data=params, session=session, sleep=sleep)
+        query = data.get("query", {})
+        for entry in query.get("normalized", []):
+            normalized[entry["to"]] = entry["from"]
+        for page in query.get("pages", []):
+            if any(FILM_CATEGORY_RE.match(cat["title"]) for cat in page.get("categories", [])):
+                film_titles.add(normalized.get(page["title"], page["title"]))
+        if "continue" not in data:
+            return film_titles
+        params = {**base_params, **data["continue"]}
+
+
+def prefilter_film_titles(
+    titles: List[str],
+    session: SeedSession,
+    sleep: float,
+    batch_size: int = 50,
+) -> List[str]:
+    # Sequential on purpose: MediaWiki API etiquette asks for one request at a time.
+    film_titles: Set[str] = set()
+    for i in range(0, len(titles), batch_size):
+        film_titles |= mw_batch_categories(titles[i : i + batch_size], session=session, sleep=sleep)
+    return [title for title in titles if title in film_titles]
+
+
+@functools.lru_cache(maxsize=8192)
 def normalize_key(title: str) -> str:
-    return re.sub(r"\s+", " ", title.strip().lower())
+    return WHITESPACE_RE.sub(" ", title.strip().lower())
 
 
-def extract_ranked_from_html(html: str) -> List[Tuple[int, str]]:
-    soup = BeautifulSoup(html, "html.parser")
+def iter_html_end_events(html: str, tags: Tuple[str, ...]):
+    # Feed the page in slices so the parser never needs a second full copy of it.
+    parser = etree.HTMLPullParser(events=("end",), tag=tags)
+    for offset in range(0, len(html), HTML_FEED_CHUNK):
+        parser.feed(html[offset : offset + HTML_FEED_CHUNK])
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
 
-    # Prefer ordered lists with significant length.
-    for ol in soup.find_all("ol"):
-        lis = ol.find_all("li", recursive=False)
-        if len(lis) < 50:
-            continue
-        results: List[Tuple[int, str]] = []
-        for idx, li in enumerate(lis, start=1):
-            title = extract_title_from_node(li)
-            if title:
-                results.append((idx, title))
-        if results:
-            return results
-
-    # Fallback to tables with rank column.
-    table_candidates = soup.select("table.wikitable, table.sortable, table")
-    for table in table_candidates:
-        results: List[Tuple[int, str]] = []
-        for row in table.find_all("tr"):
-            cells = row.find_all(["th", "td"])
-            if not cells:
-                continue
-            rank = extract_rank(cells[0].get_text())
-            if rank is None:
-                continue
-            title = extract_title_from_node(row)
-            if title:
-                results.append((rank, title))
-        if results:
-            return results
 
-    return []
+def extract_ranked_from_html(html: str) -> List[Tuple[int, str]]:
+    # Stream <ol>/<table> end events and drop each top-level one once scored,
+    # so a large list page never has to be held as a full tree.
+    table_results: List[Tuple[int, str]] = []
+    # Qualifying lists nested in another <ol>; they close before their enclosing list,
+    # so they are held until the outermost list closes and the first opened one wins.
+    nested_lists: Dict[etree._Element, List[Tuple[int, str]]] = {}
+    for _, element in iter_html_end_events(html, ("ol", "table")):
+        if element.tag == "ol":
+            # Prefer ordered lists with significant length.
+            results: List[Tuple[int, str]] = []
+            lis = element.findall("li")
+            if len(lis) >= 50:
+                for idx, li in enumerate(lis, start=1):
+                    title = extract_title_from_node(li)
+                    if title:
+                        results.append((idx, title))
+            if next(element.iterancestors("ol"), None) is not None:
+                if results:
+                    nested_lists[element] = results
+            elif results:
+                return results
+            elif nested_lists:
+                first = next(ol for ol in element.iter("ol") if ol in nested_lists)
+                return nested_lists[first]
+        elif not table_results and next(element.iterancestors("table"), None) is None:
+            # Fallback to tables with rank column. Only outermost tables are scored
+            # (nested rows included), so the first table opened wins, not the first closed.
+            for row in element.iter("tr"):
+                cells = FIRST_CELL_XPATH(row)
+                if not cells:
+                    continue
+                rank = extract_rank(node_text(cells[0]))
+                if rank is None:
+                    continue
+                title = extract_title_from_node(row)
+                if title:
+                    table_results.append((rank, title))
+
+        # Nested lists and tables are still needed by their enclosing element.
+        if next(element.iterancestors("ol", "table"), None) is None:
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+    return table_results
 
 
 def extract_rank(text: str) -> Optional[int]:
-    match = re.search(r"\b(\d{1,3})\b", text)
+    match = RANK_RE.search(text)
     if match:
         return int(match.group(1))
     return None
 
 
+def node_text(node) -> str:
+    return "".join(node.itertext()).strip()
+
+
 def extract_title_from_node(node) -> Optional[str]:
     # Prefer italicized film titles.
-    italic = node.find("i")
-    if italic:
-        link = italic.find("a")
-        if link and link.get("href", "").startswith("/wiki/"):
-            return link.get_text(strip=True)
-        text = italic.get_text(strip=True)
+    italic = node.find(".//i")
+    if italic is not None:
+        link = italic.find(".//a")
+        if link is not None and link.get("href", "").startswith("/wiki/"):
+            return node_text(link)
+        text = node_text(italic)
         if text:
             return text
 
     # Fallback to first valid link.
-    for link in node.find_all("a"):
+    for link in node.iter("a"):
         href = link.get("href", "")
         if not href.startswith("/wiki/"):
             continue
-        title = link.get("title") or link.get_text(strip=True)
+        title = link.get("title") or node_text(link)
         if not title:
             continue
         if ":" in title:
@@ -435,20 +595,29 @@ def extract_title_from_node(node) -> Optional[str]:
 
 
 def build_goat_scores(
-    headers: Dict[str, str],
+    session: SeedSession,
     sleep: float,
+    max_workers: int,
 ) -> Dict[str, Dict[str, int]]:
     scores: Dict[str, Dict[str, int]] = {}
 
-    for entry in GOAT_LIST_QUERIES:
+    def fetch_list(entry: Dict[str, str]) -> Tuple[Optional[str], Optional[str]]:
+        page_title = mw_opensearch(entry["query"], session=session, sleep=sleep)
+        if not page_title:
+            return None, None
+        return page_title, mw_parse_html(page_title, session=session, sleep=sleep)
+
+    # Each list runs opensearch -> parse in its own worker, so no list waits on another's lookup.
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(GOAT_LIST_QUERIES))) as executor:
+        pages = list(executor.map(fetch_list, GOAT_LIST_QUERIES))
+
+    for entry, (page_title, html) in zip(GOAT_LIST_QUERIES, pages):
         list_id = entry["id"]
         query = entry["query"]
-        page_title = mw_opensearch(query, headers=headers, sleep=sleep)
         if not page_title:
             print(f"[warn] No Wikipedia page found for list query: {query}", file=sys.stderr)
             continue
 
-        html = mw_parse_html(page_title, headers=headers, sleep=sleep)
         if not html:
             print(f"[warn] Failed to parse list page: {page_title}", file=sys.stderr)
             continue
@@ -498,7 +667,13 @@ def main() -> int:
     cache_dir = Path(args.cache_dir)
     ensure_dirs(output_dir, cache_dir)
 
-    headers = {"User-Agent": args.user_agent}
+    session = build_session(
+        args.user_agent,
+        args.max_workers,
+        cache_dir=cache_dir,
+        use_cache=not args.no_cache,
+        save_cache=args.save_cache,
+    )
 
     today = dt.date.today()
     end_year, end_month = last_complete_month(today)
@@ -511,41 +686,43 @@ def main() -> int:
     candidate_views = build_candidate_titles(
         months=months,
         top_limit=args.top_limit,
-        headers=headers,
-        cache_dir=cache_dir,
-        use_cache=not args.no_cache,
-        save_cache=args.save_cache,
+        session=session,
         sleep=args.sleep,
+        max_workers=args.max_workers,
     )
 
     candidates = list(candidate_views.keys())
     print(f"[info] Candidate titles: {len(candidates)}")
 
+    print("[info] Prefiltering candidates by film categories...")
+    category_candidates = prefilter_film_titles(
+        candidates,
+        session=session,
+        sleep=args.sleep,
+    )
+    print(f"[info] Category candidates: {len(category_candidates)}")
+
     print("[info] Filtering candidates to films via WDQS...")
     film_items = filter_films(
-        candidates,
-        headers=headers,
-        cache_dir=cache_dir,
-        use_cache=not args.no_cache,
-        save_cache=args.save_cache,
+        category_candidates,
+        session=session,
         sleep=args.sleep,
+        max_workers=args.max_workers,
     )
     print(f"[info] Film candidates: {len(film_items)}")
 
     film_by_key = {normalize_key(item.wikipedia_title): item for item in film_items}
 
     print("[info] Computing GOAT list scores...")
-    goat_scores = build_goat_scores(headers=headers, sleep=args.sleep)
+    goat_scores = build_goat_scores(session=session, sleep=args.sleep, max_workers=args.max_workers)
 
     # Resolve GOAT titles to film items via WDQS
     goat_titles = [entry["title"] for entry in goat_scores.values()]
     goat_items = filter_films(
         goat_titles,
-        headers=headers,
-        cache_dir=cache_dir,
-        use_cache=not args.no_cache,
-        save_cache=args.save_cache,
+        session=session,
         sleep=args.sleep,
+        max_workers=args.max_workers,
     )
     # Ensure GOAT items are included even if they were not in top-page candidates.
     for item in goat_items:
@@ -555,17 +732,16 @@ def main() -> int:
 
     goat_keys = {normalize_key(item.wikipedia_title) for item in goat_items}
 
-    goat_ranked = sorted(
-        [
-            (key, data)
-            for key, data in goat_scores.items()
-            if normalize_key(data["title"]) in goat_keys
-        ],
-        key=lambda item: (-item[1]["points"], -item[1]["lists"], item[1]["best_rank"]),
-    )
-    goat_ranked = goat_ranked[: args.goat_limit]
+    goat_ranked = [
+        ((-data["points"], -data["lists"], data["best_rank"]), key, data)
+        for key, data in goat_scores.items()
+        if normalize_key(data["title"]) in goat_keys
+    ]
+    goat_ranked.sort(key=itemgetter(0))
 
-    goat_selected: Dict[str, Dict[str, int]] = {key: data for key, data in goat_ranked}
+    goat_selected: Dict[str, Dict[str, int]] = {
+        key: data for _, key, data in goat_ranked[: args.goat_limit]
+    }
 
     print("[info] Fetching pageviews for film candidates...")
     pv_totals: Dict[str, int] = {}
@@ -574,12 +750,8 @@ def main() -> int:
         try:
             total = fetch_pageviews_total(
                 item.wikipedia_title,
-                start=start_date,
-                end=end_date,
-                headers=headers,
-                cache_dir=cache_dir,
-                use_cache=not args.no_cache,
-                save_cache=args.save_cache,
+                months=months,
+                session=session,
                 sleep=args.sleep,
             )
             return key, total, None
@@ -597,23 +769,22 @@ def main() -> int:
                 )
             pv_totals[key] = total
 
-    max_pv = max(pv_totals.values()) if pv_totals else 1
+    max_pv_inv = 1.0 / (max(pv_totals.values(), default=0) or 1)
     us_weights = load_us_weights(args.us_weight_file)
 
-    def search_score(key: str) -> float:
-        pv_norm = pv_totals.get(key, 0) / max_pv
-        us_weight = us_weights.get(key, 0.0)
-        if us_weights:
-            return 0.75 * pv_norm + 0.25 * us_weight
-        return pv_norm
+    if us_weights:
+        search_scores = {
+            key: 0.75 * pv_totals.get(key, 0) * max_pv_inv + 0.25 * us_weights.get(key, 0.0)
+            for key in film_by_key
+        }
+    else:
+        search_scores = {key: pv_totals.get(key, 0) * max_pv_inv for key in film_by_key}
 
     goat_keys = set(goat_selected.keys())
     likely_candidates = [
-        (key, search_score(key))
-        for key in film_by_key.keys()
-        if key not in goat_keys
+        (key, score) for key, score in search_scores.items() if key not in goat_keys
     ]
-    likely_candidates.sort(key=lambda item: item[1], reverse=True)
+    likely_candidates.sort(key=itemgetter(1), reverse=True)
     likely_selected = likely_candidates[: max(0, args.seed_limit - args.goat_limit)]
 
     seed_items = []
@@ -629,7 +800,7 @@ def main() -> int:
                 "segment": "goat",
                 "goat_score": data["points"],
                 "pageviews_12m": pv_totals.get(key, 0),
-                "search_score": search_score(key),
+                "search_score": search_scores[key],
             }
         )
     for key, score in likely_selected:
@@ -662,7 +833,7 @@ def main() -> int:
 
     json_path = output_dir / "seed_500.json"
     csv_path = output_dir / "seed_500.csv"
-    json_path.write_text(json.dumps(output, indent=2))
+    json_path.write_bytes(orjson.dumps(output, option=orjson.OPT_INDENT_2))
 
     with csv_path.open("w", encoding="utf-8", newline="") as handle:
         header = [
@@ -674,18 +845,20 @@ def main() -> int:
             "pageviews_12m",
             "search_score",
         ]
-        handle.write(",".join(header) + "\n")
-        for item in seed_items:
-            row = [
+        writer = csv.writer(handle, quoting=csv.QUOTE_ALL, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(
+            [
                 item["title"],
                 item["wikipedia_title"],
                 item["wikidata_id"],
                 item["segment"],
-                "" if item["goat_score"] is None else str(item["goat_score"]),
-                str(item["pageviews_12m"]),
+                "" if item["goat_score"] is None else item["goat_score"],
+                item["pageviews_12m"],
                 f"{item['search_score']:.6f}",
             ]
-            handle.write(",".join(f'"{col}"' for col in row) + "\n")
+            for item in seed_items
+        )
 
     print(f"[info] Wrote: {json_path}")
     print(f"[info] Wrote: {csv_path}")
@@ -76,40 +76,40 @@ def main() -> int:
         print(f"[info] Parsed rows: {len(rows)}")
         return 0
 
+    # executemany pipelines the statements instead of waiting on one round trip per row.
     with psycopg.connect(dsn) as conn:
         with conn.cursor() as cur:
-            for row in rows:
-                cur.execute(
-                    """
-                    INSERT INTO films (
-                        title,
-                        wikipedia_title,
-                        wikidata_id,
-                        seed_segment,
-                        goat_score,
-                        pageviews_12m,
-                        search_score
-                    )
-                    VALUES (
-                        %(title)s,
-                        %(wikipedia_title)s,
-                        %(wikidata_id)s,
-                        %(seed_segment)s,
-                        %(goat_score)s,
-                        %(pageviews_12m)s,
-                        %(search_score)s
-                    )
-                    ON CONFLICT (wikidata_id) WHERE wikidata_id IS NOT NULL
-                    DO UPDATE SET
-                        title = EXCLUDED.title,
-                        wikipedia_title = EXCLUDED.wikipedia_title,
-                        seed_segment = EXCLUDED.seed_segment,
-                        goat_score = EXCLUDED.goat_score,
-                        pageviews_12m = EXCLUDED.pageviews_12m,
-                        search_score = EXCLUDED.search_score
-                    """,
-                    row,
+            cur.executemany(
+                """
+                INSERT INTO films (
+                    title,
+                    wikipedia_title,
+                    wikidata_id,
+                    seed_segment,
+                    goat_score,
+                    pageviews_12m,
+                    search_score
                 )
+                VALUES (
+                    %(title)s,
+                    %(wikipedia_title)s,
+                    %(wikidata_id)s,
+                    %(seed_segment)s,
+                    %(goat_score)s,
+                    %(pageviews_12m)s,
+                    %(search_score)s
+                )
+                ON CONFLICT (wikidata_id) WHERE wikidata_id IS NOT NULL
+                DO UPDATE SET
+                    title = EXCLUDED.title,
+                    wikipedia_title = EXCLUDED.wikipedia_title,
+                    seed_segment = EXCLUDED.seed_segment,
+                    goat_score = EXCLUDED.goat_score,
+                    pageviews_12m = EXCLUDED.pageviews_12m,
+                    search_score = EXCLUDED.search_score
+                """,
+                rows,
+            )
 
     print(f"[info] Imported rows: {len(rows)}")
     return 0